@@ -1,7 +1,7 @@
 import logging
 
 from django.contrib.auth.models import AbstractBaseUser, AnonymousUser, User
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 from django.forms import (
     Form,
     IntegerField,
@@ -31,8 +31,11 @@ class GenerateTestForm(Form):
 
     def __init__(self, *args, **kwargs):
         self.user: AbstractBaseUser | AnonymousUser = kwargs.pop("user")
+        templates_qs: QuerySet[Template] | None = kwargs.pop("templates_qs", None)
         super().__init__(*args, **kwargs)
-        self.fields["template"].queryset = Template.objects.filter(author=self.user)
+        self.fields["template"].queryset = (
+            templates_qs if templates_qs is not None else Template.objects.filter(author=self.user)
+        )
 
     def get_template(self) -> Template:
         assert self.is_valid()
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import logging
 import uuid
-from base64 import b64encode
-from typing import Iterable
+from typing import Callable, Iterable
 
 from django.contrib.auth.models import User
 from django.core.files.base import ContentFile
@@ -51,14 +50,7 @@ class ProblemKind(IntegerChoices):
     EXPONENT_OPERATION_PROBLEM = 5, _("Exponent operation problem")
 
     def generate(self) -> TestVersionProblem:
-        problem_generator = {
-            ProblemKind.LINEAR_INEQUALITY: app.math.make_linear_inequality_problem,
-            ProblemKind.QUADRATIC_INEQUALITY: app.math.make_quadratic_inequality_problem,
-            ProblemKind.FRACTIONAL_INEQUALITY: app.math.make_fractional_inequality_problem,
-            ProblemKind.EXPONENT_REDUCTION_PROBLEM: app.math.make_exponent_reduction_problem,
-            ProblemKind.EXPONENT_OPERATION_PROBLEM: app.math.make_exponent_operation_problem,
-        }
-        generated_problem = problem_generator[self]()
+        generated_problem = _PROBLEM_GENERATOR[self]()
 
         problem = TestVersionProblem()
         problem.kind = self
@@ -68,14 +60,25 @@ class ProblemKind(IntegerChoices):
 
     @staticmethod
     def get_problem_text(problem_kind: ProblemKind) -> str:
-        PROBLEM_TEXT = {
-            ProblemKind.LINEAR_INEQUALITY: _("Solve the following linear inequalities:"),
-            ProblemKind.QUADRATIC_INEQUALITY: _("Solve the following quadratic inequalities:"),
-            ProblemKind.FRACTIONAL_INEQUALITY: _("Solve the following fractional inequalities:"),
-            ProblemKind.EXPONENT_REDUCTION_PROBLEM: _("Reduce the following expressions:"),
-            ProblemKind.EXPONENT_OPERATION_PROBLEM: _("Perform the following operations:"),
-        }
-        return PROBLEM_TEXT[problem_kind]
+        return _PROBLEM_TEXT[problem_kind]
+
+
+_PROBLEM_GENERATOR: dict[ProblemKind, Callable[[], app.math.Problem]] = {
+    ProblemKind.LINEAR_INEQUALITY: app.math.make_linear_inequality_problem,
+    ProblemKind.QUADRATIC_INEQUALITY: app.math.make_quadratic_inequality_problem,
+    ProblemKind.FRACTIONAL_INEQUALITY: app.math.make_fractional_inequality_problem,
+    ProblemKind.EXPONENT_REDUCTION_PROBLEM: app.math.make_exponent_reduction_problem,
+    ProblemKind.EXPONENT_OPERATION_PROBLEM: app.math.make_exponent_operation_problem,
+}
+
+# Built once at import time. The labels are lazy, so they are still translated per request.
+_PROBLEM_TEXT = {
+    ProblemKind.LINEAR_INEQUALITY: _("Solve the following linear inequalities:"),
+    ProblemKind.QUADRATIC_INEQUALITY: _("Solve the following quadratic inequalities:"),
+    ProblemKind.FRACTIONAL_INEQUALITY: _("Solve the following fractional inequalities:"),
+    ProblemKind.EXPONENT_REDUCTION_PROBLEM: _("Reduce the following expressions:"),
+    ProblemKind.EXPONENT_OPERATION_PROBLEM: _("Perform the following operations:"),
+}
 
 
 class TestGenerationParameters(BaseModel):
@@ -119,7 +122,9 @@ class Template(Entity):
 
     @property
     def problem_count(self) -> int:
-        return TemplateProblem.objects.filter(template=self).count()
+        # A template holds at most one entry per `ProblemKind`, so loading the entries is cheap,
+        # and it lets list views count them from a `prefetch_related` cache.
+        return len(self.templateproblem_set.all())
 
     @property
     def problem_kinds(self) -> Iterable[ProblemKind]:
@@ -190,6 +195,9 @@ class Template(Entity):
 class TemplateProblem(Entity):
     """A `ProblemKind` instance in the given `Template`."""
 
+    if TYPE_CHECKING:  # Add missing type hints.
+        template_id: uuid.UUID
+
     template = ForeignKey(Template, on_delete=CASCADE)
     # We add a default value so forms render nicer (don't have a empty placeholder '-----')
     problem_kind = IntegerField(choices=ProblemKind.choices, default=1)
@@ -243,9 +251,6 @@ class TestVersion(Entity):
     def generate_pdf(self) -> PDFCompilationError | PDF:
         return compile_pdf(render_test_version(self))
 
-    def pdf_b64_str(self) -> str:
-        return b64encode(self.pdf.read()).decode("utf-8")
-
 
 class TestVersionProblem(Entity):
     kind = IntegerField(choices=ProblemKind.choices)
@@ -294,7 +299,8 @@ class Test(Entity):
 
     @property
     def version_count(self) -> int:
-        return self.testversion_set.count()
+        # Counted in Python so list views can serve it from a `prefetch_related` cache.
+        return len(self.testversion_set.all())
 
     @property
     def versions(self) -> Iterable[TestVersion]:
@@ -306,9 +312,6 @@ class Test(Entity):
     def add_version(self, test_version: TestVersion) -> None:
         self.testversion_set.add(test_version)
 
-    def answer_key_pdf_b64_str(self) -> str:
-        return b64encode(self.answer_key_pdf.read()).decode("utf-8")
-
     def generate_answer_key_pdf(self) -> PDFCompilationError | PDF:
         return compile_pdf(render_answer_key(self))
 
@@ -0,0 +1,34 @@
+import pytest
+from django.test import Client
+
+from app.models import Template, User
+from app.tests.lib import create_user
+
+
+@pytest.fixture(scope="module")
+def _module_client() -> Client:
+    return Client()
+
+
+@pytest.fixture
+def mclient(_module_client: Client, db):
+    """
+    Return a `Client` shared by all tests in a module.
+
+    The client is logged out and its cookies are cleared after each test,
+    so no session state leaks between tests.
+    """
+    yield _module_client
+    _module_client.logout()
+    _module_client.cookies.clear()
+
+
+@pytest.fixture
+def logged_in_user(mclient: Client) -> User:
+    return create_user(mclient)
+
+
+@pytest.fixture
+def inequalities_template(logged_in_user: User) -> Template:
+    """Return the "Inequalities" template every new user gets by default."""
+    return Template.objects.get(author=logged_in_user, name="Inequalities")
@@ -1,10 +1,11 @@
 import random
 import string
+from typing import Any
 
 from django.test import Client
 from django.urls import reverse
 
-from app.models import User
+from app.models import Test, User
 
 
 def create_user(client: Client):
@@ -22,3 +23,13 @@ def create_user(client: Client):
         },
     )
     return User.objects.get(username=username)
+
+
+def bulk_make_tests(user: User, specs: list[dict[str, Any]]) -> list[Test]:
+    """
+    Create a `Test` for each field spec in a single INSERT.
+
+    Note that `bulk_create` skips `save()` and its signals, so only use this for
+    setting up data, not when the behaviour under test depends on saving.
+    """
+    return Test.objects.bulk_create([Test(author=user, **spec) for spec in specs])
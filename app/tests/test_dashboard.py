@@ -0,0 +1,27 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from app.models import Template
+from app.tests.lib import bulk_make_tests, create_user
+
+
+@pytest.mark.django_db
+def test_dashboard_counts_only_users_own_templates_and_saved_tests(client: Client):
+    alice = create_user(client)
+    bob = create_user(client)
+    bulk_make_tests(
+        alice,
+        [
+            {"name": "Saved 1", "is_saved": True},
+            {"name": "Saved 2", "is_saved": True},
+            {"name": "Unsaved", "is_saved": False},
+        ],
+    )
+    bulk_make_tests(bob, [{"name": "Saved", "is_saved": True}])
+
+    client.force_login(alice)
+    response = client.get(reverse("app:dashboard"))
+
+    assert response.context["template_count"] == Template.objects.filter(author=alice).count()
+    assert response.context["test_count"] == 2
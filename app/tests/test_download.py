@@ -30,7 +30,7 @@ def test_user_can_download_test_version(client: Client):
     client.force_login(user)
     response = client.get(reverse("app:testversion-download", kwargs={"pk": test_version.pk}))
 
-    assert response.content == expected_data
+    assert response.getvalue() == expected_data
 
 
 @pytest.mark.django_db
@@ -65,7 +65,7 @@ def test_user_can_download_test_answer_key(client: Client):
     client.force_login(user)
     response = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))
 
-    assert response.content == answer_key_data
+    assert response.getvalue() == answer_key_data
 
 
 @pytest.mark.django_db
@@ -83,3 +83,132 @@ def test_user_can_not_download_other_users_test_answer_key(client: Client):
     response = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))
 
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_unchanged_test_answer_key_is_not_downloaded_again(client: Client):
+    user = create_user(client)
+    test = Test()
+    test.author = user
+    test.name = "Test"
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test.is_saved = True
+    test.save()
+    client.force_login(user)
+    etag = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))["ETag"]
+
+    response = client.get(
+        reverse("app:test-download", kwargs={"pk": test.pk}), HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_user_can_not_revalidate_other_users_test_answer_key(client: Client):
+    alice = create_user(client)
+    eve = create_user(client)
+    test = Test()
+    test.author = alice
+    test.name = "Test"
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test.is_saved = True
+    test.save()
+    client.force_login(alice)
+    etag = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))["ETag"]
+
+    client.force_login(eve)
+    response = client.get(
+        reverse("app:test-download", kwargs={"pk": test.pk}), HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_unchanged_test_version_is_not_downloaded_again(client: Client):
+    user = create_user(client)
+    test = Test()
+    test.author = user
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test_version = TestVersion()
+    test_version.test = test
+    test_version.pdf.save("test.pdf", ContentFile("foobar"))
+    client.force_login(user)
+    url = reverse("app:testversion-download", kwargs={"pk": test_version.pk})
+    etag = client.get(url)["ETag"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_user_can_not_revalidate_other_users_test_version(client: Client):
+    alice = create_user(client)
+    eve = create_user(client)
+    test = Test()
+    test.author = alice
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test_version = TestVersion()
+    test_version.test = test
+    test_version.pdf.save("test.pdf", ContentFile("foobar"))
+    client.force_login(alice)
+    url = reverse("app:testversion-download", kwargs={"pk": test_version.pk})
+    etag = client.get(url)["ETag"]
+
+    client.force_login(eve)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_test_answer_key_can_be_embedded_in_same_origin_pages(client: Client):
+    user = create_user(client)
+    test = Test()
+    test.author = user
+    test.name = "Test"
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test.is_saved = True
+    test.save()
+
+    client.force_login(user)
+    response = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))
+
+    assert response["X-Frame-Options"] == "SAMEORIGIN"
+
+
+@pytest.mark.django_db
+def test_test_version_can_be_embedded_in_same_origin_pages(client: Client):
+    user = create_user(client)
+    test = Test()
+    test.author = user
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test_version = TestVersion()
+    test_version.test = test
+    test_version.pdf.save("test.pdf", ContentFile("foobar"))
+
+    client.force_login(user)
+    response = client.get(reverse("app:testversion-download", kwargs={"pk": test_version.pk}))
+
+    assert response["X-Frame-Options"] == "SAMEORIGIN"
+
+
+@pytest.mark.django_db
+def test_test_preview_loads_pdfs_from_download_urls(client: Client):
+    user = create_user(client)
+    test = Test()
+    test.author = user
+    test.answer_key_pdf.save("answers.pdf", ContentFile("foobar"))
+    test_version = TestVersion()
+    test_version.test = test
+    test_version.pdf.save("test.pdf", ContentFile("foobar"))
+
+    client.force_login(user)
+    response = client.get(reverse("app:test-generation", kwargs={"preview_test_pk": test.pk}))
+
+    content = response.content.decode()
+    assert reverse("app:test-download", kwargs={"pk": test.pk}) in content
+    assert reverse("app:testversion-download", kwargs={"pk": test_version.pk}) in content
+    assert "data:application/pdf;base64" not in content
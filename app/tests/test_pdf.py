@@ -51,7 +51,7 @@ b) 12x − 7 > 0"""
 
     response = client.get(reverse("app:testversion-download", kwargs={"pk": test_version.pk}))
 
-    pdf_text = _extract_pdf_text(response.content)
+    pdf_text = _extract_pdf_text(response.getvalue())
     print(expected_text)
     print(pdf_text)
     assert expected_text in pdf_text
@@ -75,5 +75,5 @@ a) (−∞, ∞)"""
 
     response = client.get(reverse("app:test-download", kwargs={"pk": test.pk}))
 
-    pdf_text = _extract_pdf_text(response.content)
+    pdf_text = _extract_pdf_text(response.getvalue())
     assert expected_text in pdf_text
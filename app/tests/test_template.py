@@ -1,10 +1,12 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from app.models import Template
+from app.models import ProblemKind, Template
 from app.tests.lib import create_user
 
 
@@ -121,3 +123,31 @@ def test_user_can_not_get_other_users_template(client: Client):
     response = client.get(reverse("app:template-detail", kwargs={"pk": template.pk}))
 
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_template_list_query_count_does_not_grow_with_templates(client: Client):
+    user = create_user(client)
+    client.force_login(user)
+    with CaptureQueriesContext(connection) as before:
+        client.get(reverse("app:template-list"))
+
+    for name in ["A", "B", "C"]:
+        template = Template.objects.create(author=user, name=name)
+        template.add_problem(ProblemKind.LINEAR_INEQUALITY)
+    with CaptureQueriesContext(connection) as after:
+        client.get(reverse("app:template-list"))
+
+    assert len(after) == len(before)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", ["app:template-update", "app:template-delete"])
+def test_template_form_cancels_back_to_template(client: Client, view_name: str):
+    user = create_user(client)
+    template: Template = Template.objects.create(author=user, name="My template")
+
+    client.force_login(user)
+    response = client.get(reverse(view_name, kwargs={"pk": template.pk}))
+
+    assert response.context["cancellation_url"] == template.get_absolute_url()
@@ -81,3 +81,20 @@ def test_user_can_not_create_template_problem_with_same_problem_kind_more_than_o
     )
 
     assert TemplateProblem.objects.filter(template__pk=template.pk).count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", ["app:templateproblem-update", "app:templateproblem-delete"])
+def test_template_problem_form_cancels_back_to_template(client: Client, view_name: str):
+    user = create_user(client)
+    template = Template()
+    template.author = user
+    template.name = "My template"
+    template.save()
+    template.add_problem(ProblemKind.LINEAR_INEQUALITY)
+    template_problem = TemplateProblem.objects.get(template=template)
+
+    client.force_login(user)
+    response = client.get(reverse(view_name, kwargs={"pk": template_problem.pk}))
+
+    assert response.context["cancellation_url"] == template.get_absolute_url()
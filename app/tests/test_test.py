@@ -2,28 +2,31 @@ from http import HTTPStatus
 
 import pytest
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from app.annoying import get_object_or_None
 from app.models import (
     Template,
     Test,
+    TestVersion,
+    User,
 )
-from app.tests.lib import create_user
+from app.tests.lib import bulk_make_tests, create_user
 
 
 @pytest.mark.django_db
-def test_user_can_generate_a_test(client: Client):
-    user = create_user(client)
-    template = Template.objects.filter(author=user, name="Inequalities").first()
-    assert template is not None
+def test_user_can_generate_a_test(
+    mclient: Client, logged_in_user: User, inequalities_template: Template
+):
+    user = logged_in_user
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-generate"),
         {
-            "template": template.pk,
+            "template": inequalities_template.pk,
             "test_version_count": 1,
         },
     )
@@ -32,14 +35,14 @@ def test_user_can_generate_a_test(client: Client):
 
 
 @pytest.mark.django_db
-def test_user_can_not_generate_an_empty_test(client: Client):
-    user = create_user(client)
-    client.post(reverse("app:template-create"), {"name": "empty template"})
+def test_user_can_not_generate_an_empty_test(mclient: Client):
+    user = create_user(mclient)
+    mclient.post(reverse("app:template-create"), {"name": "empty template"})
     template: Template = Template.objects.get(author=user, name="empty template")
     assert template is not None
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-generate"),
         {
             "template": template.pk,
@@ -47,13 +50,12 @@ def test_user_can_not_generate_an_empty_test(client: Client):
         },
     )
 
-    test = get_object_or_None(Test, author=user)
-    assert test is None
+    assert not Test.objects.filter(author=user).exists()
 
 
 @pytest.mark.django_db
-def test_user_can_update_test_name(client: Client):
-    user = create_user(client)
+def test_user_can_update_test_name(mclient: Client):
+    user = create_user(mclient)
     test = Test()
     test.author = user
     test.name = "A"
@@ -63,39 +65,39 @@ def test_user_can_update_test_name(client: Client):
     test.save()
     expected_name = "B"
 
-    client.force_login(user)
-    client.post(reverse("app:test-update", kwargs={"pk": test.pk}), {"name": expected_name})
+    mclient.force_login(user)
+    mclient.post(reverse("app:test-update", kwargs={"pk": test.pk}), {"name": expected_name})
 
     test = Test.objects.get(pk=test.pk)
     assert test.name == expected_name
 
 
 @pytest.mark.django_db
-def test_user_can_delete_test(client: Client):
-    user = create_user(client)
+def test_user_can_delete_test(mclient: Client):
+    user = create_user(mclient)
     test = Test()
     test.author = user
     test.name = "Test"
     test.answer_key_pdf.save("answers.pdf", ContentFile(""))
     test.is_saved = True
 
-    client.force_login(user)
-    client.post(reverse("app:test-delete", kwargs={"pk": test.pk}))
+    mclient.force_login(user)
+    mclient.post(reverse("app:test-delete", kwargs={"pk": test.pk}))
 
-    assert not Test.objects.contains(test)
+    assert not Test.objects.filter(pk=test.pk).exists()
 
 
 @pytest.mark.django_db
-def test_user_can_save_test(client: Client):
-    user = create_user(client)
+def test_user_can_save_test(mclient: Client):
+    user = create_user(mclient)
     unsaved_test = Test()
     unsaved_test.author = user
     unsaved_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
     unsaved_test.is_saved = False
     unsaved_test.save()
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-save", kwargs={"pk": unsaved_test.pk}),
         {
             "name": "Fall test",
@@ -107,16 +109,16 @@ def test_user_can_save_test(client: Client):
 
 
 @pytest.mark.django_db
-def test_saved_test_has_input_name(client: Client):
-    user = create_user(client)
+def test_saved_test_has_input_name(mclient: Client):
+    user = create_user(mclient)
     unsaved_test = Test()
     unsaved_test.author = user
     unsaved_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
     unsaved_test.save()
     test_name = "Fall test"
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-save", kwargs={"pk": unsaved_test.pk}),
         {
             "name": test_name,
@@ -128,16 +130,16 @@ def test_saved_test_has_input_name(client: Client):
 
 
 @pytest.mark.django_db
-def test_user_can_not_save_other_users_test(client: Client):
-    alice = create_user(client)
-    eve = create_user(client)
+def test_user_can_not_save_other_users_test(mclient: Client):
+    alice = create_user(mclient)
+    eve = create_user(mclient)
     alice_test = Test()
     alice_test.author = alice
     alice_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
     alice_test.save()
 
-    client.force_login(eve)
-    response = client.post(
+    mclient.force_login(eve)
+    response = mclient.post(
         reverse("app:test-save", kwargs={"pk": alice_test.pk}),
         {
             "name": "Get pwned",
@@ -148,8 +150,8 @@ def test_user_can_not_save_other_users_test(client: Client):
 
 
 @pytest.mark.django_db
-def test_user_can_not_save_test_with_nonunique_name(client: Client):
-    user = create_user(client)
+def test_user_can_not_save_test_with_nonunique_name(mclient: Client):
+    user = create_user(mclient)
     existing_test = Test()
     existing_test.author = user
     existing_test.name = "Fall test"
@@ -161,8 +163,8 @@ def test_user_can_not_save_test_with_nonunique_name(client: Client):
     new_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
     new_test.save()
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-save", kwargs={"pk": new_test.pk}),
         {
             "name": "Fall test",
@@ -174,125 +176,127 @@ def test_user_can_not_save_test_with_nonunique_name(client: Client):
 
 
 @pytest.mark.django_db
-def test_unsaved_tests_are_deleted_after_test_generation(client: Client):
-    user = create_user(client)
-    unsaved_test = Test()
-    unsaved_test.author = user
-    unsaved_test.name = "Spring test"
-    unsaved_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    unsaved_test.is_saved = False
-    unsaved_test.save()
-    template = Template.objects.filter(author=user, name="Inequalities").first()
-    assert template is not None
+def test_unsaved_tests_are_deleted_after_test_generation(
+    mclient: Client, logged_in_user: User, inequalities_template: Template
+):
+    user = logged_in_user
+    (unsaved_test,) = bulk_make_tests(
+        user, [{"name": "Spring test", "answer_key_pdf": "answers.pdf", "is_saved": False}]
+    )
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-generate"),
         {
-            "template": template.pk,
+            "template": inequalities_template.pk,
             "test_version_count": 1,
         },
     )
 
-    assert not Test.objects.contains(unsaved_test)
+    assert not Test.objects.filter(pk=unsaved_test.pk).exists()
 
 
 @pytest.mark.django_db
-def test_saved_tests_are_kept_after_test_generation(client: Client):
-    user = create_user(client)
-    saved_test = Test()
-    saved_test.author = user
-    saved_test.name = "Spring test"
-    saved_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    saved_test.is_saved = True
-    saved_test.save()
-    template = Template.objects.filter(author=user, name="Inequalities").first()
-    assert template is not None
+def test_saved_tests_are_kept_after_test_generation(
+    mclient: Client, logged_in_user: User, inequalities_template: Template
+):
+    user = logged_in_user
+    (saved_test,) = bulk_make_tests(
+        user, [{"name": "Spring test", "answer_key_pdf": "answers.pdf", "is_saved": True}]
+    )
 
-    client.force_login(user)
-    client.post(
+    mclient.force_login(user)
+    mclient.post(
         reverse("app:test-generate"),
         {
-            "template": template.pk,
+            "template": inequalities_template.pk,
             "test_version_count": 1,
         },
     )
 
-    assert Test.objects.contains(saved_test)
+    assert Test.objects.filter(pk=saved_test.pk).exists()
 
 
 @pytest.mark.django_db
-def test_can_not_update_test_title_to_existing_title(client: Client):
-    user = create_user(client)
-    test_1 = Test()
-    test_1.author = user
-    test_1.name = "Test 1"
-    test_1.title = "Important test"
-    test_1.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    test_1.is_saved = True
-    test_1.save()
-    test_2 = Test()
-    test_2.author = user
-    test_2.name = "Test 2"
-    test_2.title = "Important test"
-    test_2.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    test_2.is_saved = True
-    test_2.save()
+def test_can_not_update_test_title_to_existing_title(mclient: Client):
+    user = create_user(mclient)
+    test_1, test_2 = bulk_make_tests(
+        user,
+        [
+            {
+                "name": name,
+                "title": "Important test",
+                "answer_key_pdf": "answers.pdf",
+                "is_saved": True,
+            }
+            for name in ["Test 1", "Test 2"]
+        ],
+    )
     expected_name = test_1.name
 
-    client.force_login(user)
+    mclient.force_login(user)
     update_data = {"name": test_2.name, "title": test_1.title}
-    client.post(reverse("app:test-update", kwargs={"pk": test_1.pk}), update_data)
+    mclient.post(reverse("app:test-update", kwargs={"pk": test_1.pk}), update_data)
 
     test_1 = Test.objects.get(pk=test_1.pk)
     assert test_1.name == expected_name
 
 
 @pytest.mark.django_db
-def test_unsaved_tests_of_other_users_are_kept_after_test_generation(client: Client):
-    alice = create_user(client)
-    bob = create_user(client)
-    bob_test = Test()
-    bob_test.author = bob
-    bob_test.name = "Bob test"
-    bob_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    bob_test.is_saved = False
-    bob_test.save()
-    template = Template.objects.filter(author=alice, name="Inequalities").first()
-    assert template is not None
+def test_unsaved_tests_of_other_users_are_kept_after_test_generation(
+    mclient: Client, logged_in_user: User, inequalities_template: Template
+):
+    alice = logged_in_user
+    bob = create_user(mclient)
+    (bob_test,) = bulk_make_tests(
+        bob, [{"name": "Bob test", "answer_key_pdf": "answers.pdf", "is_saved": False}]
+    )
 
-    client.force_login(alice)
-    client.post(
+    mclient.force_login(alice)
+    mclient.post(
         reverse("app:test-generate"),
         {
-            "template": template.pk,
+            "template": inequalities_template.pk,
             "test_version_count": 1,
         },
     )
 
-    assert Test.objects.contains(bob_test)
+    assert Test.objects.filter(pk=bob_test.pk).exists()
 
 
 @pytest.mark.django_db
-def test_saved_tests_of_other_users_are_kept_after_test_generation(client: Client):
-    alice = create_user(client)
-    bob = create_user(client)
-    bob_test = Test()
-    bob_test.author = bob
-    bob_test.name = "Bob test"
-    bob_test.answer_key_pdf.save("answers.pdf", ContentFile(""))
-    bob_test.is_saved = True
-    bob_test.save()
-    template = Template.objects.filter(author=alice, name="Inequalities").first()
-    assert template is not None
+def test_saved_tests_of_other_users_are_kept_after_test_generation(
+    mclient: Client, logged_in_user: User, inequalities_template: Template
+):
+    alice = logged_in_user
+    bob = create_user(mclient)
+    (bob_test,) = bulk_make_tests(
+        bob, [{"name": "Bob test", "answer_key_pdf": "answers.pdf", "is_saved": True}]
+    )
 
-    client.force_login(alice)
-    client.post(
+    mclient.force_login(alice)
+    mclient.post(
         reverse("app:test-generate"),
         {
-            "template": template.pk,
+            "template": inequalities_template.pk,
             "test_version_count": 1,
         },
     )
 
-    assert Test.objects.contains(bob_test)
+    assert Test.objects.filter(pk=bob_test.pk).exists()
+
+
+@pytest.mark.django_db
+def test_test_list_query_count_does_not_grow_with_tests(mclient: Client, logged_in_user: User):
+    user = logged_in_user
+    mclient.force_login(user)
+    bulk_make_tests(user, [{"name": "Test 0", "is_saved": True}])
+    with CaptureQueriesContext(connection) as before:
+        mclient.get(reverse("app:test-list"))
+
+    tests = bulk_make_tests(user, [{"name": f"Test {i}", "is_saved": True} for i in range(1, 4)])
+    TestVersion.objects.bulk_create([TestVersion(test=test) for test in tests])
+    with CaptureQueriesContext(connection) as after:
+        mclient.get(reverse("app:test-list"))
+
+    assert len(after) == len(before)
@@ -1,13 +1,14 @@
 import logging
+from functools import cached_property, lru_cache
 from typing import Any, Iterable
 from uuid import UUID
 
-import django.views.generic
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.http import (
+    FileResponse,
     HttpRequest,
     HttpResponse,
     HttpResponseNotAllowed,
@@ -16,12 +17,14 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import cache_control
+from django.views.decorators.clickjacking import xframe_options_sameorigin
+from django.views.decorators.http import condition
 from django.views.generic.base import ContextMixin, TemplateView
 from django.views.generic.detail import DetailView
-from django.views.generic.edit import DeleteView
+from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from django.views.generic.list import ListView
 
-from app.annoying import get_object_or_None
 from app.forms import (
     GenerateTestForm,
     SaveTestForm,
@@ -38,11 +41,24 @@ from app.models import (
     TemplateProblem,
     Test,
     TestVersion,
+    TestVersionProblem,
     UserFeedback,
 )
 
 logger = logging.getLogger(__name__)
 
+PROBLEMKIND_COUNT = len(ProblemKind.values)
+
+
+@lru_cache(maxsize=1)
+def _problemkind_examples() -> list[TestVersionProblem]:
+    """
+    Generate one example problem of each `ProblemKind`.
+
+    Generating the examples is slow, so they are generated once per process.
+    """
+    return [kind.generate() for kind in ProblemKind]
+
 
 class CancellationMixin(ContextMixin):
     cancellation_url = ""
@@ -56,14 +72,6 @@ class CancellationMixin(ContextMixin):
         return context
 
 
-class CreateView(django.views.generic.CreateView):
-    template_name_suffix = "_create_form"
-
-
-class UpdateView(django.views.generic.UpdateView):
-    template_name_suffix = "_update_form"
-
-
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = "app/dashboard.html"
 
@@ -72,7 +80,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context.update(
             user=self.request.user,
             template_count=Template.objects.filter(author=self.request.user).count(),
-            problemkind_count=len(ProblemKind.values),
+            problemkind_count=PROBLEMKIND_COUNT,
             test_count=Test.objects.filter(author=self.request.user, is_saved=True).count(),
         )
         return context
@@ -83,9 +91,17 @@ def test_generation(
     request: HttpRequest,
     preview_test_pk: UUID | None = None,
     save_test_form: SaveTestForm | None = None,
+    preview_test: Test | None = None,
 ) -> HttpResponse:
-    preview_test = get_object_or_None(Test, pk=preview_test_pk, author=request.user)
-    generate_test_form = GenerateTestForm(user=request.user)
+    if preview_test is None:
+        preview_test = (
+            Test.objects.prefetch_related("testversion_set")
+            .filter(pk=preview_test_pk, author=request.user)
+            .first()
+        )
+    # Rendering the template choices only needs the primary key and the name
+    templates_qs = Template.objects.filter(author=request.user).only("id", "name")
+    generate_test_form = GenerateTestForm(user=request.user, templates_qs=templates_qs)
     show_save_form = preview_test is not None and not preview_test.is_saved
     save_test_form = (
         (save_test_form if save_test_form is not None else SaveTestForm(user=request.user))
@@ -141,24 +157,45 @@ def test_save(request: HttpRequest, pk: UUID) -> HttpResponse:
         ) % {"url": test.get_absolute_url()}
         messages.success(request, mark_safe(message))
         return redirect("app:test-generation", preview_test_pk=pk)
-    return test_generation(request, pk, form)
+    return test_generation(request, save_test_form=form, preview_test=test)
+
+
+def _testversion_etag(request: HttpRequest, pk: UUID) -> str | None:
+    updated_at = (
+        TestVersion.objects.filter(pk=pk, test__author=request.user)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    return None if updated_at is None else f"{pk}-{updated_at.timestamp()}"
+
+
+def _test_etag(request: HttpRequest, pk: UUID) -> str | None:
+    updated_at = (
+        Test.objects.filter(pk=pk, author=request.user).values_list("updated_at", flat=True).first()
+    )
+    return None if updated_at is None else f"{pk}-{updated_at.timestamp()}"
 
 
 @login_required
+@xframe_options_sameorigin
+@cache_control(private=True, max_age=300)
+@condition(etag_func=_testversion_etag)
 def testversion_download(request: HttpRequest, pk: UUID):
     if request.method != "GET":
         return HttpResponseNotAllowed(permitted_methods=["POST"])
 
     test_version = get_object_or_404(TestVersion, pk=pk, test__author=request.user)
-    return HttpResponse(test_version.pdf.read(), content_type="application/pdf")
+    return FileResponse(test_version.pdf.open("rb"), content_type="application/pdf")
 
 
 @login_required
+@xframe_options_sameorigin
+@cache_control(private=True, max_age=300)
+@condition(etag_func=_test_etag)
 def test_download(request: HttpRequest, pk: UUID):
     if request.method == "GET":
         test = get_object_or_404(Test, pk=pk, author=request.user)
-        answer_key = test.answer_key_pdf
-        return HttpResponse(answer_key.read(), content_type="application/pdf")
+        return FileResponse(test.answer_key_pdf.open("rb"), content_type="application/pdf")
 
     return redirect("app:test-detail", kwargs={"pk": pk})
 
@@ -173,13 +210,17 @@ class ProblemKindListView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["examples"] = [kind.generate() for kind in self.get_queryset()]
+        context["examples"] = _problemkind_examples()
         return context
 
 
 class TemplateListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
-        return Template.objects.filter(author=self.request.user)
+        return (
+            Template.objects.filter(author=self.request.user)
+            .only("id", "name", "created_at")
+            .prefetch_related("templateproblem_set")
+        )
 
 
 class TemplateDetailView(LoginRequiredMixin, DetailView):
@@ -188,6 +229,7 @@ class TemplateDetailView(LoginRequiredMixin, DetailView):
 
 
 class TemplateCreateView(LoginRequiredMixin, CancellationMixin, SuccessMessageMixin, CreateView):
+    template_name = "app/template_create_form.html"
     success_message = _("The template was created successfully.")
     success_url = reverse_lazy("app:template-list")
     cancellation_url = success_url
@@ -201,12 +243,14 @@ class TemplateCreateView(LoginRequiredMixin, CancellationMixin, SuccessMessageMi
 
 
 class TemplateUpdateView(LoginRequiredMixin, CancellationMixin, SuccessMessageMixin, UpdateView):
+    template_name = "app/template_update_form.html"
     form_class = TemplateUpdateForm
 
     success_message = _("The template was updated successfully.")
 
     def get_success_url(self) -> str:
-        return reverse_lazy("app:template-detail", kwargs={"pk": self.get_object().pk})
+        template: Template = self.object  # type: ignore
+        return reverse_lazy("app:template-detail", kwargs={"pk": template.pk})
 
     def get_cancellation_url(self):
         return self.get_success_url()
@@ -226,7 +270,8 @@ class TemplateDeleteView(LoginRequiredMixin, CancellationMixin, SuccessMessageMi
     cancellation_url = success_url
 
     def get_cancellation_url(self):
-        return reverse_lazy("app:template-detail", kwargs={"pk": self.get_object().pk})
+        template: Template = self.object  # type: ignore
+        return reverse_lazy("app:template-detail", kwargs={"pk": template.pk})
 
     def get_queryset(self):
         return Template.objects.filter(author=self.request.user)
@@ -234,7 +279,11 @@ class TemplateDeleteView(LoginRequiredMixin, CancellationMixin, SuccessMessageMi
 
 class TestListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
-        return Test.objects.filter(author=self.request.user, is_saved=True)
+        return (
+            Test.objects.filter(author=self.request.user, is_saved=True)
+            .only("id", "name", "created_at")
+            .prefetch_related("testversion_set")
+        )
 
 
 class TestDetailView(LoginRequiredMixin, DetailView):
@@ -243,13 +292,15 @@ class TestDetailView(LoginRequiredMixin, DetailView):
 
 
 class TestUpdateView(LoginRequiredMixin, UpdateView):
+    template_name = "app/test_update_form.html"
     success_url = reverse_lazy("app:test-list")
     success_message = _("The test was updated successfully.")
 
     form_class = TestUpdateForm
 
     def get_cancellation_url(self):
-        return reverse_lazy("app:test-detail", kwargs={"pk": self.get_object().pk})
+        test: Test = self.object  # type: ignore
+        return reverse_lazy("app:test-detail", kwargs={"pk": test.pk})
 
     def get_queryset(self):
         return Test.objects.filter(author=self.request.user)
@@ -263,27 +314,29 @@ class TestUpdateView(LoginRequiredMixin, UpdateView):
 class TemplateProblemCreateView(
     LoginRequiredMixin, CancellationMixin, SuccessMessageMixin, CreateView
 ):
+    template_name = "app/templateproblem_create_form.html"
     form_class = TemplateProblemCreateFrom
 
     model = TemplateProblem
 
-    def get_template(self) -> Template:
+    @cached_property
+    def template(self) -> Template:
         return get_object_or_404(Template, pk=self.kwargs["template_pk"])
 
     def get_form_kwargs(self) -> dict[str, Any]:
         kwargs = super().get_form_kwargs()
         kwargs["user"] = self.request.user
-        kwargs["template"] = self.get_template()
+        kwargs["template"] = self.template
         return kwargs
 
     def get_success_url(self) -> str:
-        return reverse_lazy("app:template-detail", kwargs={"pk": self.get_template().pk})
+        return reverse_lazy("app:template-detail", kwargs={"pk": self.template.pk})
 
     def get_cancellation_url(self):
         return self.get_success_url()
 
     def form_valid(self, form):
-        form.instance.template = self.get_template()  # type: ignore
+        form.instance.template = self.template  # type: ignore
         return super().form_valid(form)
 
     def get_queryset(self):
@@ -293,13 +346,14 @@ class TemplateProblemCreateView(
 class TemplateProblemUpdateView(
     LoginRequiredMixin, CancellationMixin, SuccessMessageMixin, UpdateView
 ):
+    template_name = "app/templateproblem_update_form.html"
     form_class = TemplateProblemUpdateForm
 
     success_message = _("The problem entry was updated successfully.")
 
     def get_success_url(self) -> str:
-        template_problem: TemplateProblem = self.get_object()  # type: ignore
-        return reverse_lazy("app:template-detail", kwargs={"pk": template_problem.template.pk})
+        template_problem: TemplateProblem = self.object  # type: ignore
+        return reverse_lazy("app:template-detail", kwargs={"pk": template_problem.template_id})
 
     def get_cancellation_url(self):
         return self.get_success_url()
@@ -314,8 +368,8 @@ class TemplateProblemDeleteView(
     success_message = _("The problem entry was deleted successfully.")
 
     def get_success_url(self) -> str:
-        template_problem: TemplateProblem = self.get_object()  # type: ignore
-        return reverse_lazy("app:template-detail", kwargs={"pk": template_problem.template.pk})
+        template_problem: TemplateProblem = self.object  # type: ignore
+        return reverse_lazy("app:template-detail", kwargs={"pk": template_problem.template_id})
 
     def get_cancellation_url(self):
         return self.get_success_url()
@@ -329,7 +383,8 @@ class TestDeleteView(LoginRequiredMixin, CancellationMixin, SuccessMessageMixin,
     success_message = _("The test was deleted successfully.")
 
     def get_cancellation_url(self):
-        return reverse_lazy("app:test-detail", kwargs={"pk": self.get_object().pk})
+        test: Test = self.object  # type: ignore
+        return reverse_lazy("app:test-detail", kwargs={"pk": test.pk})
 
     def get_queryset(self):
         return Test.objects.filter(author=self.request.user)
@@ -338,6 +393,7 @@ class TestDeleteView(LoginRequiredMixin, CancellationMixin, SuccessMessageMixin,
 class UserFeedbackCreateView(
     LoginRequiredMixin, CancellationMixin, SuccessMessageMixin, CreateView
 ):
+    template_name = "app/userfeedback_create_form.html"
     model = UserFeedback
     fields = ["content"]
 
@@ -2,11 +2,12 @@ from django import template
 
 register = template.Library()
 
+_LANG_EMOJI = {
+    "en": "🇬🇧",
+    "et": "🇪🇪",
+}
+
 
 @register.filter(name="lang_emoji")
 def lang_emoji_template_filter(lang_code: str):
-    lang_emoji = {
-        "en": "🇬🇧",
-        "et": "🇪🇪",
-    }
-    return lang_emoji.get(lang_code, lang_code)
+    return _LANG_EMOJI.get(lang_code, lang_code)